@@ -3,60 +3,455 @@ Simulador de Máquina de Turing Determinista
 Basado en la definición: M = (Q, Σ, Γ, δ, q0, qaccept, qreject)
 """
 
+import re
+import sys
+from functools import lru_cache
+from itertools import islice
+
+# NumPy se importa junto con Numba solo si se usa el ciclo compilado (ver _native_step_loop)
+np = None
+
+# Se guardan todas las configuraciones de los primeros SNAPSHOT_INTERVAL pasos
+# y, después, una cada SNAPSHOT_INTERVAL pasos (además de la final)
+SNAPSHOT_INTERVAL = 100
+
+# Blancos reservados a cada lado de la entrada al inicializar la cinta
+TAPE_PADDING = 1024
+
+# Desplazamiento de la cabeza según la dirección de la transición
+MOVES = {'L': -1, 'R': 1}
+
+# Tamaño del búfer del archivo de salida y configuraciones escritas por bloque
+WRITE_BUFFER = 1 << 20
+WRITE_CHUNK = 4096
+
+# Secciones de una línea del archivo de especificación: nombre -> (atributo, es conjunto)
+SECTIONS = {
+    'Q': ('Q', True),
+    'Sigma': ('Sigma', True),
+    'Gamma': ('Gamma', True),
+    'q0': ('q0', False),
+    'qaccept': ('qaccept', False),
+    'qreject': ('qreject', False),
+}
+
+# Separador de los elementos de un conjunto, con los espacios alrededor de la coma
+SPLIT_RE = re.compile(r'\s*,\s*')
+
+# Transición en formato (q,a)->(q',b,D)
+TRANS_RE = re.compile(
+    r'\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)\s*->'
+    r'\s*\(\s*([^,\s]+)\s*,\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)'
+)
+
+
+@lru_cache(maxsize=None)
+def _transition_result(new_state, new_symbol, direction):
+    """Lado derecho de una transición con la dirección convertida a desplazamiento
+    
+    Las direcciones inválidas se conservan tal cual para que verify_specification
+    pueda reportarlas. Las transiciones con el mismo lado derecho comparten la tupla.
+    """
+    return (new_state, new_symbol, MOVES.get(direction, direction))
+
+
+# Máximo de estados con transiciones para generar un ciclo de pasos especializado
+SPECIALIZE_MAX_STATES = 16
+
+# Pasos a partir de los cuales conviene compilar el ciclo con Numba: cargar Numba
+# tarda más que ejecutar menos pasos en Python
+NATIVE_MIN_STEPS = 2_000_000
+
+# Máximo de especificaciones correctas que recuerda verify_specification
+VERIFIED_SPECS_MAX = 64
+
+# Estado siguiente en delta_next para las filas de los estados de parada
+HALT = -2
+
+# Motivos por los que _step_loop se detiene antes de agotar sus pasos
+OUT_OF_TAPE = 1  # La cabeza salió del espacio reservado para la cinta
+UNDEFINED = 2  # δ no está definida para el estado y símbolo actuales
+
+
+def _step_loop(tape, head, state, left, right, steps,
+               delta_next, delta_write, delta_move, n_symbols):
+    """Ejecuta hasta `steps` pasos sobre la cinta y tablas codificadas con enteros
+    
+    Se detiene antes si se alcanza un estado de parada (fila HALT de delta_next),
+    si δ no está definida (sin ejecutar ese paso) o si la cabeza sale de la cinta
+    reservada.
+    Retorna (estado, cabeza, left, right, pasos ejecutados, motivo de parada).
+    """
+    size = len(tape)
+    done = 0
+    while done < steps:
+        key = state * n_symbols + tape[head]
+        new_state = delta_next[key]
+        if new_state < 0:
+            # Las filas de los estados de parada están marcadas con HALT,
+            # así que detectarlos no cuesta una comparación extra por paso
+            if new_state == HALT:
+                break
+            return state, head, left, right, done, UNDEFINED
+        
+        tape[head] = delta_write[key]
+        state = new_state
+        done += 1
+        
+        # Mover la cabeza sin ramificar según la dirección; las comparaciones
+        # con los extremos casi nunca se cumplen y son fáciles de predecir.
+        # La cabeza solo puede salir de la cinta reservada al extender la parte lógica
+        head += delta_move[key]
+        if head < left:
+            left = head
+            if head < 0:
+                return state, head, left, right, done, OUT_OF_TAPE
+        elif head >= right:
+            right = head + 1
+            if head >= size:
+                return state, head, left, right, done, OUT_OF_TAPE
+    return state, head, left, right, done, 0
+
+
+_native_step = None  # _step_loop compilado con Numba; False si Numba no está instalado
+
+
+def _native_step_loop():
+    """Retorna _step_loop compilado con Numba, o None si Numba no está instalado
+    
+    Numba es opcional y se importa la primera vez que se necesita.
+    """
+    global np, _native_step
+    if _native_step is None:
+        try:
+            import numpy
+            from numba import njit
+        except ImportError:
+            _native_step = False
+        else:
+            np = numpy
+            _native_step = njit(cache=True, boundscheck=False)(_step_loop)
+    return _native_step or None
+
+
+def _specialize_step_loop(delta_next, delta_write, delta_move, n_symbols, qaccept, qreject):
+    """Genera una versión de _step_loop con δ incrustada en el código
+    
+    Cada estado y símbolo con transición definida se convierte en una rama con
+    constantes en lugar de tres consultas a las tablas, y cada rama solo revisa
+    el extremo de la cinta hacia el que se mueve. Retorna None si la máquina tiene
+    demasiados estados para que la cadena de comparaciones resulte conveniente.
+    Acepta los mismos argumentos que _step_loop, aunque ignora las tablas.
+    """
+    n_states = len(delta_next) // n_symbols
+    active = [q for q in range(n_states) if q != qaccept and q != qreject
+              and any(delta_next[q * n_symbols + a] >= 0 for a in range(n_symbols))]
+    if len(active) > SPECIALIZE_MAX_STATES:
+        return None
+    
+    lines = [
+        "def step_loop(tape, head, state, left, right, steps, *tables):",
+        "    size = len(tape)",
+        "    done = 0",
+        "    while done < steps:",
+    ]
+    for i, q in enumerate(active):
+        lines.append(f"        {'if' if i == 0 else 'elif'} state == {q}:")
+        lines.append("            symbol = tape[head]")
+        branches = [a for a in range(n_symbols) if delta_next[q * n_symbols + a] >= 0]
+        for j, a in enumerate(branches):
+            key = q * n_symbols + a
+            lines.append(f"            {'if' if j == 0 else 'elif'} symbol == {a}:")
+            lines.append(f"                tape[head] = {delta_write[key]}")
+            if delta_next[key] != q:
+                lines.append(f"                state = {delta_next[key]}")
+            if delta_move[key] > 0:
+                lines += ["                head += 1",
+                          "                if head >= right:",
+                          "                    right = head + 1",
+                          "                    if head >= size:",
+                          "                        return state, head, left, right, done + 1, OUT_OF_TAPE"]
+            elif delta_move[key] < 0:
+                lines += ["                head -= 1",
+                          "                if head < left:",
+                          "                    left = head",
+                          "                    if head < 0:",
+                          "                        return state, head, left, right, done + 1, OUT_OF_TAPE"]
+        lines += ["            else:",
+                  "                return state, head, left, right, done, UNDEFINED"]
+    lines += [
+        f"        {'elif' if active else 'if'} state == {qaccept} or state == {qreject}:",
+        "            break",
+        "        else:",
+        "            return state, head, left, right, done, UNDEFINED",
+        "        done += 1",
+        "    return state, head, left, right, done, 0",
+    ]
+    
+    namespace = {'OUT_OF_TAPE': OUT_OF_TAPE, 'UNDEFINED': UNDEFINED}
+    exec(compile('\n'.join(lines), '<δ especializada>', 'exec'), namespace)
+    return namespace['step_loop']
+
+
+def _blank_tape(size, compact, native=False):
+    """Crea una cinta de `size` celdas en blanco (símbolo 0)
+    
+    Si `compact` es verdadero cada celda ocupa un byte (hasta 256 símbolos).
+    Si `native` es verdadero la cinta es un arreglo de NumPy para el ciclo compilado.
+    """
+    if native:
+        return np.zeros(size, dtype=np.uint8 if compact else np.int32)
+    return bytearray(size) if compact else [0] * size
+
+
+def _logical_end(tape, left, right):
+    """Retorna el fin de tape[left:right] ignorando los blancos finales
+    
+    Se conserva siempre al menos una celda.
+    """
+    end = right
+    while end > left + 1 and tape[end - 1] == 0:
+        end -= 1
+    return end
+
+
+def _format_configuration(decoding, tape, state, head, left, right):
+    """Genera la configuración en notación uqv de tape[left:right] según `decoding`
+    
+    `decoding` es la tupla (estados, símbolos, compacta, tabla de bytes, comodines)
+    de build_tables; el blanco es siempre el símbolo 0.
+    """
+    states, symbols, compact, byte_table, placeholders = decoding
+    
+    # Ignorar blancos innecesarios al final (conservando al menos un símbolo)
+    end = _logical_end(tape, left, right)
+    
+    # Construir configuración
+    if compact:
+        view = memoryview(tape)
+        left_part = _decode_cells(view[left:min(head, end)], byte_table, placeholders)
+        right_part = _decode_cells(view[head:end], byte_table, placeholders) or symbols[0]
+    else:
+        left_part = ''.join([symbols[c] for c in tape[left:min(head, end)]])
+        right_part = ''.join([symbols[c] for c in tape[head:end]]) or symbols[0]
+    
+    return f"{left_part}{states[state]}{right_part}"
+
+
+def _decode_cells(cells, byte_table, placeholders):
+    """Decodifica celdas de una cinta compacta (un byte por símbolo) a texto"""
+    text = bytes(cells).translate(byte_table).decode('latin-1')
+    for placeholder, symbol in placeholders:
+        text = text.replace(placeholder, symbol)
+    return text
+
+
+def _tape_slice(tape, left, right):
+    """Retorna una copia de tape[left:right] sin blancos finales, independiente de la cinta"""
+    cells = tape[left:_logical_end(tape, left, right)]
+    return cells.copy() if np is not None and isinstance(cells, np.ndarray) else cells
+
+
+# Tablas para extraer cada uno de los cuatro grupos de 2 bits de un byte empaquetado
+UNPACK_TABLES = [bytes((i >> shift) & 3 for i in range(256)) for shift in (0, 2, 4, 6)]
+
+
+def _pack_cells(cells):
+    """Empaqueta celdas con símbolos 0..3 a 2 bits por celda (4 celdas por byte)
+    
+    Con los bytes de las celdas leídos como un solo entero, cada grupo de cuatro
+    se junta en su primer byte con desplazamientos, sin recorrer las celdas en Python.
+    """
+    data = bytes(cells) + bytes(-len(cells) % 4)
+    packed = int.from_bytes(data, 'little')
+    packed |= packed >> 6 | packed >> 12 | packed >> 18
+    return packed.to_bytes(len(data), 'little')[::4]
+
+
+def _unpack_cells(packed, size):
+    """Recupera las `size` celdas de un byte a partir de su forma empaquetada"""
+    cells = bytearray(4 * len(packed))
+    for i, table in enumerate(UNPACK_TABLES):
+        cells[i::4] = packed.translate(table)
+    del cells[size:]
+    return cells
+
+
+class ConfigurationLog:
+    """Registro compacto de las configuraciones producidas por TuringMachine.run
+    
+    En lugar de construir la cadena uqv en cada paso se guardan la cinta inicial,
+    las escrituras de los primeros pasos y, para las configuraciones posteriores,
+    una copia de la porción lógica de la cinta. Las cadenas se generan solamente
+    al recorrer el registro (por ejemplo, desde save_output), con los estados y
+    símbolos que tenía la máquina durante la ejecución.
+    
+    Si la cinta usa a lo sumo 4 símbolos, las copias se guardan a 2 bits por celda.
+    """
+    
+    def __init__(self, machine):
+        self.machine = machine
+        self.decoding = None  # Decodificación de build_tables; se toma con la primera configuración
+        self.packed = False  # Copias a 2 bits por celda; se decide con la primera configuración
+        self.cells = []  # Cinta inicial con la entrada a partir de la posición 0
+        self.writes = []  # Escrituras (posición, símbolo), relativas al inicio de la entrada
+        self.records = []  # Configuraciones registradas
+        self._last_head = 0  # Cabeza de la última configuración, relativa a la entrada
+    
+    def add(self, step, tape, state, head, left, right, origin):
+        """Registra una configuración producida por TuringMachine._execute
+        
+        En los primeros SNAPSHOT_INTERVAL pasos las configuraciones son consecutivas,
+        por lo que basta anotar el símbolo que quedó escrito donde estaba la cabeza
+        anterior.
+        """
+        if step >= SNAPSHOT_INTERVAL:
+            self.snapshot(state, head - left, _tape_slice(tape, left, right))
+            return
+        
+        if self.records:
+            self.writes.append((self._last_head, tape[self._last_head + origin]))
+        else:
+            # Las tablas se construyen al iniciar la ejecución; una ejecución
+            # posterior de la máquina puede reemplazarlas
+            self.decoding = decoding = self.machine._decoding
+            self.packed = decoding[2] and len(decoding[1]) <= 4
+            self.cells = _tape_slice(tape, left, right)
+        self._last_head = head - origin
+        self.mark(state, head - origin, left - origin, right - origin)
+    
+    def mark(self, state, head, left, right):
+        """Registra una configuración que se reconstruye a partir de las escrituras
+        
+        Las posiciones son relativas al inicio de la entrada.
+        """
+        self.records.append((state, head, left, right, len(self.writes)))
+    
+    def snapshot(self, state, head, cells):
+        """Registra una configuración junto con una copia de su porción lógica de cinta
+        
+        La cabeza es relativa al inicio de cells.
+        """
+        size = len(cells)
+        if self.packed:
+            cells = _pack_cells(cells)
+        self.records.append((state, head, 0, size, cells))
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def __getitem__(self, index):
+        """Retorna la configuración de la posición `index` (o la lista de un slice)
+        
+        Las configuraciones que no tienen copia de la cinta se reconstruyen
+        recorriendo el registro hasta la posición pedida.
+        """
+        if isinstance(index, slice):
+            return list(self)[index]
+        position = range(len(self.records))[index]
+        state, head, left, right, data = self.records[position]
+        if not isinstance(data, int):
+            return self._snapshot_configuration(state, head, right, data)
+        return next(islice(self, position, None))
+    
+    def _snapshot_configuration(self, state, head, size, data):
+        """Genera la configuración de un registro con copia de la cinta"""
+        if self.packed:
+            data = _unpack_cells(data, size)
+        return _format_configuration(self.decoding, data, state, head, 0, size)
+    
+    def __iter__(self):
+        """Reconstruye las configuraciones en notación uqv en orden"""
+        if not self.records:
+            return
+        decoding = self.decoding
+        writes = self.writes
+        tape = bytearray(self.cells) if decoding[2] else list(self.cells)
+        offset = 0  # Posición relativa al inicio de la entrada de tape[0]
+        applied = 0
+        
+        for state, head, left, right, data in self.records:
+            if not isinstance(data, int):
+                yield self._snapshot_configuration(state, head, right, data)
+                continue
+            
+            # Cubrir la porción lógica de la configuración en la cinta de trabajo,
+            # al menos duplicando su tamaño para no desplazarla en cada extensión
+            if left < offset:
+                growth = max(offset - left, len(tape))
+                tape[:0] = [0] * growth
+                offset -= growth
+            if right > offset + len(tape):
+                tape.extend([0] * max(right - offset - len(tape), len(tape)))
+            
+            # Aplicar las escrituras realizadas hasta esta configuración
+            for pos, symbol in writes[applied:data]:
+                tape[pos - offset] = symbol
+            applied = data
+            
+            yield _format_configuration(decoding, tape, state, head - offset, left - offset, right - offset)
+
+
 class TuringMachine:
+    # Claves de las últimas especificaciones que pasaron verify_specification,
+    # en orden de verificación (a lo sumo VERIFIED_SPECS_MAX)
+    _verified_specs = {}
+    
     def __init__(self):
         self.Q = set()  # Conjunto de estados
         self.Sigma = set()  # Alfabeto de entrada
         self.Gamma = set()  # Alfabeto de la cinta
-        self.delta = {}  # Función de transición
+        self.delta = {}  # Función de transición: (q, a) -> (q', b, -1 | 1)
         self.q0 = None  # Estado inicial
         self.qaccept = None  # Estado de aceptación
         self.qreject = None  # Estado de rechazo
         self.blank = '⊔'  # Símbolo blanco
+        self._states = []  # Estados indexados por su identificador entero
+        self._symbols = []  # Símbolos indexados por su identificador entero
+        self._compact = True  # Cinta de un byte por celda (a lo sumo 256 símbolos)
+        # Decodificación de la cinta: (estados, símbolos, compacta, traducción de la
+        # cinta compacta a texto latin-1, caracteres comodín y su símbolo)
+        self._decoding = ([], [], True, bytes(256), [])
+        self._tables = None  # Resultado de build_tables para _tables_key
+        self._tables_key = None
+        self._compiled_step = None  # Ciclo de pasos generado para las tablas actuales
         
     def load_from_file(self, filename):
         """Carga la especificación de la máquina desde un archivo"""
         try:
+            # Parsear las secciones leyendo el archivo línea por línea
+            input_string = ""
+            in_delta = False
             with open(filename, 'r', encoding='utf-8') as f:
-                lines = [line.strip() for line in f.readlines() 
-                        if line.strip() and not line.strip().startswith('#')]
-            
-            # Parsear las secciones
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                
-                if line.startswith('Q:'):
-                    self.Q = set(line[2:].strip().split(','))
-                elif line.startswith('Sigma:'):
-                    self.Sigma = set(line[6:].strip().split(','))
-                elif line.startswith('Gamma:'):
-                    self.Gamma = set(line[6:].strip().split(','))
-                elif line.startswith('q0:'):
-                    self.q0 = line[3:].strip()
-                elif line.startswith('qaccept:'):
-                    self.qaccept = line[8:].strip()
-                elif line.startswith('qreject:'):
-                    self.qreject = line[8:].strip()
-                elif line.startswith('delta:'):
-                    # Leer las transiciones
-                    i += 1
-                    while i < len(lines):
+                for line in f:
+                    line = line.strip()
+                    if not line or line[0] == '#':
+                        continue
+                    
+                    if in_delta:
                         # Detener si encontramos otra sección (línea que contiene ':' pero no es transición)
-                        if ':' in lines[i] and '->' not in lines[i]:
-                            break
-                        trans = lines[i].strip()
-                        if trans:
-                            self.parse_transition(trans)
-                        i += 1
-                    continue
-                elif line.startswith('input:'):
-                    input_string = line[6:].strip()
-                    return input_string
-                
-                i += 1
+                        if ':' not in line or '->' in line:
+                            self.parse_transition(line)
+                            continue
+                        in_delta = False
+                    
+                    name, sep, value = line.partition(':')
+                    if sep and name in SECTIONS:
+                        attr, is_set = SECTIONS[name]
+                        value = value.strip()
+                        if is_set:
+                            value = {sys.intern(x) for x in SPLIT_RE.split(value) if x}
+                        else:
+                            value = sys.intern(value)
+                        setattr(self, attr, value)
+                    elif sep and name == 'delta':
+                        # Las líneas siguientes son transiciones
+                        in_delta = True
+                    elif sep and name == 'input':
+                        input_string = value.strip()
+                        break
             
-            return ""
+            return input_string
             
         except FileNotFoundError:
             raise Exception(f"Archivo {filename} no encontrado")
@@ -65,21 +460,31 @@ class TuringMachine:
     
     def parse_transition(self, trans):
         """Parsea una transición en formato: (q,a)->(q',b,D)"""
-        try:
-            # Formato: (estado,símbolo)->(estado',símbolo',dirección)
-            left, right = trans.split('->')
-            left = left.strip().strip('()')
-            right = right.strip().strip('()')
-            
-            state, symbol = [x.strip() for x in left.split(',')]
-            new_state, new_symbol, direction = [x.strip() for x in right.split(',')]
-            
-            self.delta[(state, symbol)] = (new_state, new_symbol, direction)
-        except:
+        # Formato: (estado,símbolo)->(estado',símbolo',dirección)
+        match = TRANS_RE.fullmatch(trans)
+        if match is None:
             raise Exception(f"Error al parsear transición: {trans}")
+        
+        state, symbol, new_state, new_symbol, direction = map(sys.intern, match.groups())
+        self.delta[(state, symbol)] = _transition_result(new_state, new_symbol, direction)
+    
+    def spec_key(self):
+        """Retorna una clave que identifica por contenido a la especificación actual"""
+        return (frozenset(self.Q), frozenset(self.Sigma), frozenset(self.Gamma),
+                self.q0, self.qaccept, self.qreject, self.blank,
+                frozenset(self.delta.items()))
     
     def verify_specification(self):
-        """Verifica que la especificación de la máquina sea correcta"""
+        """Verifica que la especificación de la máquina sea correcta
+        
+        Una especificación con el mismo contenido (ver spec_key) que otra que ya
+        resultó correcta no se vuelve a revisar.
+        """
+        key = self.spec_key()
+        verified = TuringMachine._verified_specs
+        if key in verified:
+            return []
+        
         errors = []
         
         # Verificar que los conjuntos no estén vacíos
@@ -113,7 +518,7 @@ class TuringMachine:
             errors.append("Estado de aceptación y rechazo no pueden ser iguales")
         
         # Verificar función de transición
-        for (state, symbol), (new_state, new_symbol, direction) in self.delta.items():
+        for (state, symbol), (new_state, new_symbol, move) in self.delta.items():
             if state not in self.Q:
                 errors.append(f"Estado {state} en δ no está en Q")
             if symbol not in self.Gamma:
@@ -122,130 +527,295 @@ class TuringMachine:
                 errors.append(f"Estado {new_state} en δ no está en Q")
             if new_symbol not in self.Gamma:
                 errors.append(f"Símbolo {new_symbol} en δ no está en Γ")
-            if direction not in ['L', 'R']:
-                errors.append(f"Dirección {direction} debe ser L o R")
+            if MOVES.get(move, move) not in (-1, 1):
+                errors.append(f"Dirección {move} debe ser L o R")
         
+        if not errors:
+            if len(verified) >= VERIFIED_SPECS_MAX:
+                del verified[next(iter(verified))]
+            verified[key] = None
         return errors
     
+    def build_tables(self, input_string=""):
+        """Internaliza estados y símbolos como enteros y representa δ como tablas planas
+        
+        Para el par (estado, símbolo) con identificadores (q, a) la transición se
+        encuentra en la posición q * len(símbolos) + a de las tablas; un estado
+        siguiente -1 indica que δ no está definida y HALT que el estado es de parada.
+        El blanco siempre es el símbolo 0.
+        
+        Las tablas se reutilizan mientras la especificación no cambie (ver spec_key)
+        y la entrada no traiga símbolos nuevos.
+        """
+        key = self.spec_key()
+        if (key == self._tables_key
+                and self._tables[1].keys() >= set(input_string)):
+            return self._tables
+        
+        states = list(dict.fromkeys(
+            [self.q0, self.qaccept, self.qreject]
+            + sorted(self.Q)
+            + [x for (state, _), (new_state, _, _) in self.delta.items() for x in (state, new_state)]
+        ))
+        symbols = list(dict.fromkeys(
+            [self.blank]
+            + sorted(self.Gamma)
+            + [x for (_, symbol), (_, new_symbol, _) in self.delta.items() for x in (symbol, new_symbol)]
+            + list(input_string)
+        ))
+        state_id = {q: i for i, q in enumerate(states)}
+        sym_id = {a: i for i, a in enumerate(symbols)}
+        
+        n_symbols = len(symbols)
+        size = len(states) * n_symbols
+        delta_next = [-1] * size
+        delta_write = [0] * size
+        delta_move = [0] * size
+        for (state, symbol), (new_state, new_symbol, move) in self.delta.items():
+            index = state_id[state] * n_symbols + sym_id[symbol]
+            delta_next[index] = state_id[new_state]
+            delta_write[index] = sym_id[new_symbol]
+            # δ asignada a mano puede traer la dirección como 'L' o 'R'; una
+            # dirección inválida deja la cabeza en su lugar
+            move = MOVES.get(move, move)
+            delta_move[index] = move if move in (-1, 1) else 0
+        for halting in (state_id[self.qaccept], state_id[self.qreject]):
+            start = halting * n_symbols
+            delta_next[start:start + n_symbols] = [HALT] * n_symbols
+        
+        # Tabla para decodificar la cinta compacta: los símbolos ASCII de un carácter
+        # se traducen a sí mismos y el resto a un byte comodín que luego se reemplaza
+        compact = n_symbols <= 256
+        byte_table = bytearray(256)
+        placeholders = []
+        for i, symbol in enumerate(symbols if compact else []):
+            if len(symbol) == 1 and symbol.isascii():
+                byte_table[i] = ord(symbol)
+            elif len(placeholders) < 128:
+                byte_table[i] = 128 + len(placeholders)
+                placeholders.append((chr(128 + len(placeholders)), symbol))
+            else:
+                compact = False
+                break
+        # Los comodines se reemplazan uno tras otro, así que ningún símbolo puede
+        # contener un carácter comodín; en ese caso se decodifica símbolo por símbolo
+        limit = 128 + len(placeholders)
+        if compact and any(128 <= ord(c) < limit for symbol in symbols for c in symbol):
+            compact = False
+        
+        self._states = states
+        self._symbols = symbols
+        self._compact = compact
+        self._decoding = (states, symbols, compact, bytes(byte_table), placeholders)
+        self._tables = (state_id, sym_id, delta_next, delta_write, delta_move)
+        self._tables_key = key
+        self._compiled_step = None
+        return self._tables
+    
     def run(self, input_string, max_steps=10000, debug=False):
-        """Ejecuta la máquina de Turing sobre la cadena de entrada"""
-        # Inicializar la cinta
-        if input_string:
-            tape = list(input_string)
+        """Ejecuta la máquina de Turing sobre la cadena de entrada
+        
+        Retorna el registro de configuraciones (ConfigurationLog) y el resultado.
+        El registro se recorre e indexa como la lista de configuraciones en notación uqv.
+        """
+        execution = self._execute(input_string, max_steps, debug)
+        configurations = ConfigurationLog(self)
+        add = configurations.add
+        try:
+            while True:
+                add(*next(execution))
+        except StopIteration as stop:
+            return configurations, stop.value
+    
+    def run_stream(self, input_string, max_steps=10000, debug=False):
+        """Ejecuta la máquina generando cada configuración en notación uqv al producirse
+        
+        A diferencia de run, las configuraciones no se acumulan en memoria.
+        Al agotarse, el generador retorna el resultado de la ejecución.
+        """
+        execution = self._execute(input_string, max_steps, debug)
+        get_configuration = self.get_configuration
+        try:
+            while True:
+                step, tape, state, head, left, right, origin = next(execution)
+                yield get_configuration(tape, state, head, left, right)
+        except StopIteration as stop:
+            return stop.value
+    
+    def _execute(self, input_string, max_steps, debug):
+        """Ejecuta la máquina generando las configuraciones que se deben guardar
+        
+        Cada configuración se genera como (paso, cinta, estado, cabeza, left, right,
+        origen) sobre la cinta en uso, que sigue modificándose al reanudar el
+        generador; origen es la posición en la cinta de la primera celda de la entrada.
+        Al agotarse, el generador retorna el resultado de la ejecución.
+        """
+        state_id, sym_id, delta_next, delta_write, delta_move = self.build_tables(input_string)
+        n_symbols = len(sym_id)
+        qaccept = state_id[self.qaccept]
+        qreject = state_id[self.qreject]
+        
+        # Referencias locales para no buscar atributos en cada iteración.
+        # Solo las ejecuciones largas compensan cargar el ciclo compilado con Numba
+        step_loop = _native_step_loop() if max_steps >= NATIVE_MIN_STEPS else None
+        native = step_loop is not None
+        if native:
+            delta_next, delta_write, delta_move = (
+                np.array(table, dtype=np.int32) for table in (delta_next, delta_write, delta_move))
         else:
-            tape = [self.blank]
+            # En Python, δ se incrusta en un ciclo generado para esta máquina
+            if self._compiled_step is None:
+                self._compiled_step = _specialize_step_loop(
+                    delta_next, delta_write, delta_move, n_symbols, qaccept, qreject) or _step_loop
+            step_loop = self._compiled_step
+        compact = self._compact
+        
+        # Inicializar la cinta con holgura de blancos (símbolo 0) a ambos lados.
+        # La parte lógica de la cinta es tape[left:right]; fuera de ella todo es blanco.
+        cells = [sym_id[a] for a in input_string] if input_string else [0]
+        tape = _blank_tape(len(cells) + 2 * TAPE_PADDING, compact, native)
+        tape[TAPE_PADDING:TAPE_PADDING + len(cells)] = cells
+        left = TAPE_PADDING
+        right = TAPE_PADDING + len(cells)
+        origin = TAPE_PADDING  # Posición en tape de la primera celda de la entrada
         
         # Configuración inicial
-        state = self.q0
-        head = 0
+        state = state_id[self.q0]
+        head = left
         step = 0
-        configurations = []
         
         # Agregar configuración inicial
-        config = self.get_configuration(tape[:], state, head)
-        configurations.append(config)
+        yield step, tape, state, head, left, right, origin
         
-        # Ejecutar la máquina
-        while state != self.qaccept and state != self.qreject and step < max_steps:
-            # Extender la cinta si es necesario
-            if head < 0:
-                tape.insert(0, self.blank)
-                head = 0
-            if head >= len(tape):
-                tape.append(self.blank)
-            
-            # Leer el símbolo actual
-            current_symbol = tape[head]
+        # Ejecutar la máquina: los primeros pasos se dan de uno en uno; después
+        # se avanza de una vez hasta la siguiente configuración a guardar
+        next_snapshot = SNAPSHOT_INTERVAL
+        while state != qaccept and state != qreject and step < max_steps:
+            if step < SNAPSHOT_INTERVAL:
+                steps = 1
+            else:
+                steps = min(next_snapshot, max_steps) - step
             
             # Debug: mostrar primeros 20 pasos
             if debug and step < 20:
-                print(f"Paso {step}: estado={state}, cabeza={head}, símbolo='{current_symbol}', cinta={''.join(tape)}")
+                symbols = self._symbols
+                print(f"Paso {step}: estado={self._states[state]}, cabeza={head - left}, símbolo='{symbols[tape[head]]}', cinta={''.join(symbols[c] for c in tape[left:right])}")
+            
+            previous = head
+            state, head, left, right, done, status = step_loop(
+                tape, head, state, left, right, steps,
+                delta_next, delta_write, delta_move, n_symbols)
             
-            # Buscar transición
-            if (state, current_symbol) not in self.delta:
+            if status == UNDEFINED:
                 # No hay transición definida, rechazar
-                state = self.qreject
-                config = self.get_configuration(tape[:], state, head)
-                configurations.append(config)
+                step += done
+                state = qreject
+                yield step, tape, state, head, left, right, origin
                 break
             
-            # Aplicar transición
-            new_state, new_symbol, direction = self.delta[(state, current_symbol)]
-            
             if debug and step < 20:
-                print(f"  -> nuevo_estado={new_state}, escribe='{new_symbol}', dirección={direction}")
-            
-            # Escribir nuevo símbolo
-            tape[head] = new_symbol
+                print(f"  -> nuevo_estado={self._states[state]}, escribe='{self._symbols[tape[previous]]}', dirección={'R' if head > previous else 'L'}")
+            step += done
             
-            # Mover cabeza
-            if direction == 'R':
-                head += 1
-            elif direction == 'L':
-                head -= 1
+            # La cinta solo se realoja (duplicando su tamaño) cuando la cabeza
+            # agota la holgura de uno de los extremos
+            if status == OUT_OF_TAPE:
+                size = len(tape)
+                grown = _blank_tape(2 * size, compact, native)
                 if head < 0:
-                    tape.insert(0, self.blank)
-                    head = 0
+                    grown[size:] = tape
+                    head += size
+                    left += size
+                    right += size
+                    origin += size
+                else:
+                    grown[:size] = tape
+                tape = grown
             
-            # Actualizar estado
-            state = new_state
-            step += 1
-            
-            # Guardar configuración (solo cada 100 pasos si hay muchos)
-            if step < 100 or step % 100 == 0 or state in [self.qaccept, self.qreject]:
-                config = self.get_configuration(tape[:], state, head)
-                configurations.append(config)
+            # Guardar configuración (solo cada SNAPSHOT_INTERVAL pasos si hay muchos)
+            if step == next_snapshot:
+                next_snapshot += SNAPSHOT_INTERVAL
+                yield step, tape, state, head, left, right, origin
+            elif step < SNAPSHOT_INTERVAL or state == qaccept or state == qreject:
+                yield step, tape, state, head, left, right, origin
         
         # Resultado
         if step >= max_steps:
             result = "CICLO INFINITO (límite de pasos alcanzado)"
-        elif state == self.qaccept:
+        elif state == qaccept:
             result = "ACEPTADA"
-        elif state == self.qreject:
+        elif state == qreject:
             result = "RECHAZADA"
         else:
             result = "DESCONOCIDO"
         
-        return configurations, result
+        return result
     
-    def get_configuration(self, tape, state, head):
-        """Genera la configuración en notación uqv"""
-        # Eliminar blancos innecesarios al final
-        while len(tape) > 1 and tape[-1] == self.blank:
-            tape.pop()
-        
-        # Asegurar al menos un símbolo
-        if not tape:
-            tape = [self.blank]
+    def get_configuration(self, tape, state, head, left=0, right=None):
+        """Genera la configuración en notación uqv de la porción tape[left:right]
         
-        # Construir configuración
-        left_part = ''.join(tape[:head])
-        right_part = ''.join(tape[head:])
-        
-        if not right_part:
-            right_part = self.blank
-        
-        config = f"{left_part}{state}{right_part}"
-        return config
+        La cinta y el estado vienen codificados con los identificadores de build_tables.
+        La cinta no se modifica ni se copia completa.
+        """
+        if right is None:
+            right = len(tape)
+        return _format_configuration(self._decoding, tape, state, head, left, right)
     
     def save_output(self, filename, configurations, result):
         """Guarda las configuraciones en un archivo de salida"""
-        with open(filename, 'w', encoding='utf-8') as f:
+        with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
             f.write("CONFIGURACIONES DE LA MÁQUINA DE TURING\n")
             f.write("=" * 50 + "\n\n")
             
-            for i, config in enumerate(configurations):
-                f.write(f"{config}\n")
+            # Escribir las configuraciones por bloques, con una sola escritura por bloque
+            lines = iter(configurations)
+            while True:
+                chunk = list(islice(lines, WRITE_CHUNK))
+                if not chunk:
+                    break
+                f.write('\n'.join(chunk) + '\n')
             
-            f.write("\n" + "=" * 50 + "\n")
-            f.write(f"RESULTADO: {result}\n")
-            f.write(f"Número de pasos: {len(configurations) - 1}\n")
+            self._write_result(f, result, len(configurations))
+    
+    def save_output_stream(self, filename, stream):
+        """Guarda en un archivo de salida las configuraciones generadas por run_stream
+        
+        Las configuraciones se escriben a medida que se producen.
+        Retorna el resultado de la ejecución y el número de configuraciones.
+        """
+        with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
+            f.write("CONFIGURACIONES DE LA MÁQUINA DE TURING\n")
+            f.write("=" * 50 + "\n\n")
+            
+            # Escribir las configuraciones por bloques, con una sola escritura por bloque
+            count = 0
+            chunk = []
+            while True:
+                try:
+                    chunk.append(next(stream))
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                if len(chunk) == WRITE_CHUNK:
+                    f.write('\n'.join(chunk) + '\n')
+                    count += len(chunk)
+                    chunk = []
+            if chunk:
+                f.write('\n'.join(chunk) + '\n')
+                count += len(chunk)
+            
+            self._write_result(f, result, count)
+        return result, count
+    
+    def _write_result(self, f, result, count):
+        """Escribe el resultado al final del archivo de salida"""
+        f.write("\n" + "=" * 50 + "\n")
+        f.write(f"RESULTADO: {result}\n")
+        f.write(f"Número de pasos: {count - 1}\n")
 
 
 def main():
     """Función principal"""
-    import sys
-    
     if len(sys.argv) != 3:
         print("Uso: python turing_simulator.py <archivo_entrada> <archivo_salida>")
         sys.exit(1)
@@ -274,13 +844,11 @@ def main():
         
         # Ejecutar máquina
         print(f"\nEjecutando máquina con entrada: '{input_string}'")
-        configurations, result = tm.run(input_string)
-        
-        # Guardar salida
-        tm.save_output(output_file, configurations, result)
+        # Guardar salida a medida que se generan las configuraciones
+        result, count = tm.save_output_stream(output_file, tm.run_stream(input_string))
         print(f"\n✓ Resultado: {result}")
         print(f"✓ Configuraciones guardadas en: {output_file}")
-        print(f"✓ Total de pasos: {len(configurations) - 1}")
+        print(f"✓ Total de pasos: {count - 1}")
         
     except Exception as e:
         print(f"\nERROR: {str(e)}")